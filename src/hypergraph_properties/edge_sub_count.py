@@ -1,6 +1,6 @@
 from fractions import Fraction
 
-from hypergraph_properties.isomorphism import is_isomorphic, find_isomorphic_representative, hypergraph_automorphisms
+from hypergraph_properties.isomorphism import is_isomorphic, find_isomorphic_representative, count_automorphisms
 from hypergraph_properties.partitions import vertex_partitions, moebius_function
 from hypergraph_properties.homomorphisms import count_homomorphisms
 
@@ -20,7 +20,7 @@ def aggregate_quotient_coefficients(graphlets):
     coefficients = {}
 
     for H in graphlets:
-        aut_count = len(hypergraph_automorphisms(H))
+        aut_count = count_automorphisms(H)
 
         for partition in vertex_partitions(H.vertices):
             quotient = H.quotient(partition)
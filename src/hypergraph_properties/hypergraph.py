@@ -1,3 +1,43 @@
+def _popcount(x):
+    """
+    Return the number of 1-bits in the integer x (population count).
+    """
+    try:
+        return x.bit_count()
+    except AttributeError:
+        return bin(x).count("1")
+
+
+def _iter_bits(m):
+    """
+    Yield the indices of the 1-bits of the non-negative integer m, lowest first.
+
+    Runs in O(popcount(m)): the lowest set bit is isolated as m & -m and cleared.
+    """
+    while m:
+        b = m & -m
+        yield b.bit_length() - 1
+        m ^= b
+
+
+def _render_edge(labels):
+    """
+    Return (sort key, text) of a hyperedge, given the str() of its vertices.
+
+    The key orders edges by size, then lexicographically by their sorted labels.
+    """
+    labels = sorted(labels)
+    return (len(labels), labels), "{" + ", ".join(labels) + "}"
+
+
+def _render_edges(rendered):
+    """
+    Join the (sort key, text) pairs of all hyperedges into { {..}, {..}, ... }.
+    """
+    rendered = sorted(rendered, key=lambda r: r[0])
+    return "{" + ", ".join(text for _, text in rendered) + "}"
+
+
 class Hypergraph:
     """
     Minimal hypergraph H = (V, E) focused on quotient hypergraph construction w.r.t. a vertex partition
@@ -8,74 +48,162 @@ class Hypergraph:
 
     Why frozensets: more memory-efficient than sets, hashable.
 
+    Internally, every vertex occurring in a hyperedge gets a bit index (_vid),
+    and each hyperedge is stored as the integer bitmask of its vertices
+    (_edge_masks, parallel to edges). Deduplication and degree computations
+    work on these ints; the frozensets in edges are built in the same pass,
+    and the set view edge_set is materialized on first access.
+
 
     """
 
     def __init__(self, vertices=None, edges=None, vertex_attrs=None, edge_attrs=None):
         self.vertices = set(vertices) if vertices is not None else set()
-        self.edges = []
-        self.edge_attrs = []
-        self.edge_set = set()
         self.vertex_attrs = dict(vertex_attrs) if vertex_attrs is not None else {}
 
+        self._vid = {}
+        self._vlist = []
+        self._edge_masks = []
+        self._mask_set = set()
+        self.edges = []
+        self._edge_set = None
+
+        # Cache of set_of_sets_string(); reset on mutation.
+        self._set_of_sets_str = None
+
+        # Caches of edge_sizes(), edge_size_sequence(), degree() and degree_sequence(); reset on mutation.
+        self._edge_sizes_cache = None
+        self._edge_size_sequence_cache = None
+        self._degree_cache = None
+        self._degree_sequence_cache = None
+
         if edges is not None:
-            for e in edges:
-                fe = frozenset(e)
-                if len(fe) == 0:
-                    raise ValueError("Empty hyperedges are not allowed.")
-                if fe in self.edge_set:
-                    continue
-                self.edge_set.add(fe)
-                self.edges.append(fe)
+            self._insert_edges(edges)
 
         if edge_attrs is None:
-            self.edge_attrs = [{} for _ in self.edges]
+            self.edge_attrs = [{} for _ in self._edge_masks]
         else:
-            if len(edge_attrs) != len(self.edges):
+            if len(edge_attrs) != len(self._edge_masks):
                 raise ValueError("edge_attrs must have the same length as edges.")
             self.edge_attrs = [dict(a) for a in edge_attrs]
 
-        for e in self.edges:
-            self.vertices.update(e)
+    def _insert_edges(self, edges):
+        """
+        Append each hyperedge of edges that is not already present.
+
+        Every hyperedge is turned into a bitmask straight from its vertices,
+        assigning bit indices to vertices seen for the first time (which are
+        also added to self.vertices), and deduplicated on that mask. The
+        frozenset is only built for hyperedges that are kept.
+        """
+        vid = self._vid
+        vlist = self._vlist
+        vertices = self.vertices
+        mask_set = self._mask_set
+        edge_masks = self._edge_masks
+        kept = self.edges
+        edge_set = self._edge_set
+        for nodes in edges:
+            m = 0
+            for v in nodes:
+                i = vid.get(v)
+                if i is None:
+                    i = vid[v] = len(vlist)
+                    vlist.append(v)
+                    vertices.add(v)
+                m |= 1 << i
+            if m == 0:
+                raise ValueError("Empty hyperedges are not allowed.")
+            if m in mask_set:
+                continue
+            mask_set.add(m)
+            edge_masks.append(m)
+
+            e = frozenset(nodes)
+            if not e:
+                # nodes was a one-shot iterator, consumed by the mask loop.
+                e = frozenset(vlist[i] for i in _iter_bits(m))
+            kept.append(e)
+            if edge_set is not None:
+                edge_set.add(e)
+
+    @property
+    def edge_set(self):
+        if self._edge_set is None:
+            self._edge_set = set(self.edges)
+        return self._edge_set
 
     @classmethod
     def from_edges(cls, edge_sets, vertex_attrs=None, edge_attrs=None):
-        edges = []
-        for s in edge_sets:
-            e = frozenset(s)
-            if len(e) == 0:
-                raise ValueError("Empty hyperedges are not allowed.")
-            edges.append(e)
-        return cls(vertices=None, edges=edges, vertex_attrs=vertex_attrs, edge_attrs=edge_attrs)
+        # Edges are validated and deduplicated on their bitmasks by __init__.
+        return cls(vertices=None, edges=edge_sets, vertex_attrs=vertex_attrs, edge_attrs=edge_attrs)
+
+    def _invalidate_degrees(self):
+        self._degree_cache = None
+        self._degree_sequence_cache = None
 
     def add_vertex(self, v, **attrs):
+        if v not in self.vertices:
+            self._invalidate_degrees()
         self.vertices.add(v)
         if attrs:
             self.vertex_attrs.setdefault(v, {}).update(attrs)
 
     def add_edge(self, nodes, **attrs):
-        e = frozenset(nodes)
-        if len(e) == 0:
-            raise ValueError("Empty hyperedges are not allowed.")
-        if e in self.edge_set:
+        eid = len(self._edge_masks)
+        self._insert_edges((nodes,))
+        if len(self._edge_masks) == eid:
             return None
-        self.edge_set.add(e)
-        self.edges.append(e)
         self.edge_attrs.append(dict(attrs))
-        self.vertices.update(e)
-        return len(self.edges) - 1
+        self._set_of_sets_str = None
+        self._edge_sizes_cache = None
+        self._edge_size_sequence_cache = None
+        self._invalidate_degrees()
+        return eid
 
     def num_vertices(self):
         return len(self.vertices)
 
     def num_edges(self):
-        return len(self.edges)
+        return len(self._edge_masks)
 
     def edge_sizes(self):
-        return [len(e) for e in self.edges]
+        if self._edge_sizes_cache is None:
+            self._edge_sizes_cache = tuple(_popcount(m) for m in self._edge_masks)
+        return list(self._edge_sizes_cache)
+
+    def edge_size_sequence(self):
+        """
+        Return the hyperedge sizes as a sorted tuple (cached).
+        """
+        if self._edge_size_sequence_cache is None:
+            self._edge_size_sequence_cache = tuple(sorted(_popcount(m) for m in self._edge_masks))
+        return self._edge_size_sequence_cache
+
+    def _degrees(self):
+        """
+        Return the cached dictionary vertex -> degree, computed in one pass over the edges.
+        """
+        if self._degree_cache is None:
+            counts = [0] * len(self._vlist)
+            for m in self._edge_masks:
+                for i in _iter_bits(m):
+                    counts[i] += 1
+            degrees = dict.fromkeys(self.vertices, 0)
+            degrees.update(zip(self._vlist, counts))
+            self._degree_cache = degrees
+        return self._degree_cache
 
     def degree(self, v):
-        return sum(1 for e in self.edges if v in e)
+        return self._degrees().get(v, 0)
+
+    def degree_sequence(self):
+        """
+        Return the vertex degrees as a sorted tuple (cached).
+        """
+        if self._degree_sequence_cache is None:
+            self._degree_sequence_cache = tuple(sorted(self._degrees().values()))
+        return self._degree_sequence_cache
 
     def __str__(self):
         lines = []
@@ -91,6 +219,20 @@ class Hypergraph:
             lines.append(f"    e{i}: {{{nodes}}}")
         return "\n".join(lines)
 
+    def set_of_sets_string(self):
+        """
+        Return the single-line rendering of the hyperedges, e.g. {{1, 2}, {2, 3, 4}, {5}}.
+
+        Edges are sorted by size, then lexicographically by their str()-sorted
+        vertex labels. The result is cached until the next add_edge.
+        """
+        if self._set_of_sets_str is None:
+            labels = [str(v) for v in self._vlist]
+            self._set_of_sets_str = _render_edges(
+                [_render_edge(labels[i] for i in _iter_bits(m)) for m in self._edge_masks]
+            )
+        return self._set_of_sets_str
+
     def pretty_print(self):
         print(self)
 
@@ -101,12 +243,17 @@ class Hypergraph:
         validate_partition(blocks, self.vertices)
         v2blk = vertex_to_block_map(blocks)
 
-        Hq = Hypergraph(vertices=set(blocks), edges=[], vertex_attrs=None, edge_attrs=[])
-        for e in self.edges:
-            q_edge = frozenset(v2blk[v] for v in e)
-            Hq.add_edge(q_edge)
-        return Hq
+        # Image edges are deduplicated on their bitmasks by the constructor.
+        return Hypergraph(vertices=set(blocks), edges=[[v2blk[v] for v in e] for e in self.edges])
     
+    def automorphism_group(self):
+        """
+        Return Aut(H) as a sympy PermutationGroup (see isomorphism.automorphism_group).
+        """
+        from .isomorphism import automorphism_group
+
+        return automorphism_group(self)
+
     def is_alpha_acyclic(self):
         """
         Check alpha-acyclicity via GYO reduction.
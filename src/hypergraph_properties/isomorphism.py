@@ -1,7 +1,9 @@
+from collections import Counter
+
 import networkx as nx
-from networkx.algorithms.isomorphism import GraphMatcher
+import pynauty
 
-from .hypergraph import Hypergraph
+from .hypergraph import Hypergraph, _iter_bits
 
 
 def node_match_bipartite(a, b):
@@ -9,30 +11,115 @@ def node_match_bipartite(a, b):
 
 
 def to_bipartite_graph(H):
-    B = nx.Graph()
+    """
+    Build the bipartite incidence graph of H in one from_dict_of_lists call.
 
-    for v in H.vertices:
-        B.add_node(("v", v), bipartite=0)
+    Vertex-side nodes ("v", v) have bipartite=0; edge-side nodes ("e", eid) have
+    bipartite=1 and size=|e|. The composite attribute label (0 for vertices,
+    |e| for hyperedges) encodes both, for vf2pp's node_label.
+    """
+    adj = {("v", v): [] for v in H.vertices}
+    attrs = {node: {"bipartite": 0, "label": 0} for node in adj}
 
     for eid, e in enumerate(H.edges):
         enode = ("e", eid)
-        B.add_node(enode, bipartite=1, size=len(e))
-        for v in e:
-            B.add_edge(enode, ("v", v))
+        adj[enode] = [("v", v) for v in e]
+        attrs[enode] = {"bipartite": 1, "size": len(e), "label": len(e)}
 
+    B = nx.from_dict_of_lists(adj)
+    nx.set_node_attributes(B, attrs)
     return B
 
 
+def _incidence_nauty_graph(num_vertices, edges, fixed=()):
+    """
+    Build the incidence graph of a hypergraph on vertices 0..num_vertices-1 as a
+    pynauty.Graph.
+
+    edges is an iterable of hyperedges, each given as a list of vertex indices.
+
+    Vertex-side nodes are 0..num_vertices-1, in one color class; edge-side nodes
+    follow and are colored by hyperedge size. Each vertex in fixed is put in a
+    color class of its own, so that nauty only sees its pointwise stabilizer.
+    Returns the graph together with the (size, count) pairs of the edge-side
+    color classes.
+    """
+    adjacency = {}
+    cells = {}
+    for eid, e in enumerate(edges):
+        enode = num_vertices + eid
+        adjacency[enode] = e
+        cells.setdefault(len(e), set()).add(enode)
+
+    sizes = sorted(cells)
+    free = set(range(num_vertices)).difference(fixed)
+    coloring = [{v} for v in fixed] + ([free] if free else []) + [cells[s] for s in sizes]
+    g = pynauty.Graph(num_vertices + len(adjacency), adjacency_dict=adjacency, vertex_coloring=coloring)
+
+    return g, tuple((s, len(cells[s])) for s in sizes)
+
+
+def _incidence_certificate(num_vertices, edges):
+    """
+    Canonical form of the incidence graph of a hypergraph on vertices 0..num_vertices-1.
+
+    edges is an iterable of hyperedges, each given as a list of vertex indices.
+
+    Since nauty's certificate does not record the coloring itself, the color
+    class sizes are returned alongside it: two hypergraphs are isomorphic iff
+    their labels are equal.
+    """
+    if num_vertices == 0:
+        return (0, (), b"")
+
+    g, cell_sizes = _incidence_nauty_graph(num_vertices, edges)
+    return (num_vertices, cell_sizes, pynauty.certificate(g))
+
+
+def _indexed_incidence(H):
+    """
+    Return (vertices, edges) read off the edge bitmasks of H: vertices in bit
+    index order (vertices in no hyperedge last), and each hyperedge as the list
+    of indices of its vertices.
+    """
+    vertices = H._vlist + [v for v in H.vertices if v not in H._vid]
+    return vertices, [list(_iter_bits(m)) for m in H._edge_masks]
+
+
+def canonical_label(H):
+    """
+    Return a canonical label of H: a hashable value that is equal for two
+    hypergraphs iff they are isomorphic.
+    """
+    vertices, edges = _indexed_incidence(H)
+    return _incidence_certificate(len(vertices), edges)
+
+
+def _invariants_differ(H1, H2):
+    """
+    Return True if cheap invariants already prove that H1 and H2 are not
+    isomorphic: numbers of vertices and hyperedges, multisets of edge sizes
+    and of vertex degrees.
+    """
+    if H1.num_vertices() != H2.num_vertices() or H1.num_edges() != H2.num_edges():
+        return True
+    if H1.edge_size_sequence() != H2.edge_size_sequence():
+        return True
+    return H1.degree_sequence() != H2.degree_sequence()
+
+
 def is_isomorphic(H1, H2, return_mapping=False):
+    if _invariants_differ(H1, H2):
+        return (False, None) if return_mapping else False
+
+    if not return_mapping:
+        return canonical_label(H1) == canonical_label(H2)
+
     B1 = to_bipartite_graph(H1)
     B2 = to_bipartite_graph(H2)
 
-    gm = GraphMatcher(B1, B2, node_match=node_match_bipartite)
-    iso = gm.is_isomorphic()
-
-    if not return_mapping:
-        return iso
-    return iso, (gm.mapping if iso else None)
+    mapping = nx.vf2pp_isomorphism(B1, B2, node_label="label")
+    return mapping is not None, mapping
 
 def find_isomorphic_representative(H, representatives):
     """
@@ -55,16 +142,125 @@ def induced_vertex_mapping_from_incidence_mapping(incidence_mapping):
     return out
 
 
+def _automorphism_group_order(num_vertices, edges, autgrp):
+    """
+    Return the exact order of the automorphism group of the incidence graph,
+    given nauty's autgrp result for it.
+
+    nauty reports the order as grpsize1 * 10**grpsize2 with grpsize1 a float,
+    which is only exact when grpsize2 == 0. Otherwise the order is computed down
+    a stabilizer chain, |G| = |orbit of v| * |G_v|, where each stabilizer G_v
+    is obtained from nauty by individualizing v, until nauty's report is exact.
+    """
+    _, grpsize1, grpsize2, orbits, _ = autgrp
+    order = 1
+    fixed = []
+    while grpsize2 != 0:
+        # Fix a vertex-side point of a largest orbit of the current stabilizer.
+        sizes = Counter(orbits[:num_vertices])
+        v = max(range(num_vertices), key=lambda u: sizes[orbits[u]])
+        order *= sizes[orbits[v]]
+        fixed.append(v)
+
+        g, _ = _incidence_nauty_graph(num_vertices, edges, fixed)
+        _, grpsize1, grpsize2, orbits, _ = pynauty.autgrp(g)
+
+    return order * int(round(grpsize1))
+
+
+def _vertex_automorphism_generators(H):
+    """
+    Return (vertices, generators, order) for Aut(H), computed by nauty.
+
+    vertices is sorted(H.vertices, key=str); each generator is a tuple p where
+    p[i] is the index of the image of vertices[i]; order is |Aut(H)|.
+
+    For a simple hypergraph, an automorphism of the incidence graph is determined
+    by its action on the vertex side, so the edge-side part is dropped.
+    """
+    vertices = sorted(H.vertices, key=str)
+    n = len(vertices)
+    if n == 0:
+        return vertices, [], 1
+
+    nauty_vertices, edges = _indexed_incidence(H)
+    g, _ = _incidence_nauty_graph(n, edges)
+    autgrp = pynauty.autgrp(g)
+    gens = autgrp[0]
+
+    # Translate generators from bit-index order to the sorted vertex order.
+    index = {v: i for i, v in enumerate(vertices)}
+    pos = [index[v] for v in nauty_vertices]
+    sorted_gens = []
+    for p in gens:
+        q = [0] * n
+        for a in range(n):
+            q[pos[a]] = pos[p[a]]
+        sorted_gens.append(tuple(q))
+
+    return vertices, sorted_gens, _automorphism_group_order(n, edges, autgrp)
+
+
+def automorphism_generators(H):
+    """
+    Return a generating set of the vertex automorphisms of H, each as a dictionary.
+
+    The set has O(|V|) elements, however large Aut(H) is.
+    """
+    vertices, gens, _ = _vertex_automorphism_generators(H)
+    return [{v: vertices[p[i]] for i, v in enumerate(vertices)} for p in gens]
+
+
+def count_automorphisms(H):
+    """
+    Return |Aut(H)|, computed exactly from nauty without enumerating the automorphisms.
+    """
+    return _vertex_automorphism_generators(H)[2]
+
+
+def automorphism_group(H):
+    """
+    Return Aut(H) as a sympy PermutationGroup built from nauty's generators.
+
+    Point i stands for the vertex sorted(H.vertices, key=str)[i]. The group
+    elements are only enumerated if requested (e.g. via .generate()).
+    """
+    from sympy.combinatorics import Permutation, PermutationGroup
+
+    vertices, gens, _ = _vertex_automorphism_generators(H)
+    n = len(vertices)
+    if not gens:
+        return PermutationGroup([Permutation(list(range(n)))])
+    return PermutationGroup([Permutation(list(p)) for p in gens])
+
+
 def hypergraph_automorphisms(H, limit=None):
-    B = to_bipartite_graph(H)
-    gm = GraphMatcher(B, B, node_match=node_match_bipartite)
+    """
+    Return the vertex automorphisms of H as a list of dictionaries.
+
+    The group is generated by closing nauty's generators under composition.
+    If limit is given, at most limit automorphisms are generated; as before,
+    the identity is always returned, even for limit <= 0.
+    """
+    vertices, gens, _ = _vertex_automorphism_generators(H)
+    if limit is not None:
+        limit = max(limit, 1)
 
-    autos = []
-    for mapping in gm.isomorphisms_iter():
-        vmap = induced_vertex_mapping_from_incidence_mapping(mapping)
-        autos.append(vmap)
+    identity = tuple(range(len(vertices)))
+    seen = {identity}
+    perms = [identity]
 
-        if limit is not None and len(autos) >= limit:
+    # Breadth-first closure: perms grows while it is being scanned.
+    for p in perms:
+        if limit is not None and len(perms) >= limit:
             break
+        for g in gens:
+            q = tuple(g[i] for i in p)
+            if q not in seen:
+                seen.add(q)
+                perms.append(q)
+
+    if limit is not None:
+        perms = perms[:limit]
 
-    return autos
\ No newline at end of file
+    return [{v: vertices[p[i]] for i, v in enumerate(vertices)} for p in perms]
@@ -1,125 +1,190 @@
 import itertools
-import networkx as nx
-from networkx.algorithms.isomorphism import GraphMatcher
+import numpy as np
+try:
+    from numba import njit
+except ImportError:  # numba is optional: covering subsets are then enumerated in pure Python
+    njit = None
 from hypergraph_properties.hypergraph import *
-def _popcount(x):
-    """
-    Return the number of 1-bits in the integer x (population count).
-    """
-    try:
-        return x.bit_count()
-    except AttributeError:
-        return bin(x).count("1")
-
-
+from hypergraph_properties.hypergraph import _iter_bits, _popcount
+from hypergraph_properties.isomorphism import _incidence_certificate
 def _mask_to_frozenset(mask, n):
     """
     Convert an n-bit mask into a frozenset of vertex labels in {1,...,n}.
 
     Bit i (0-based) corresponds to vertex (i+1).
     """
-    out = []
-    for i in range(n):
-        if (mask >> i) & 1:
-            out.append(i + 1)
-    return frozenset(out)
+    return frozenset(i + 1 for i in _iter_bits(mask))
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _filter_covering(all_edges_arr, suffix, k, full_mask, idx, prefix, state, out):
+        """
+        Write into out the indices of the next k-subsets of all_edges_arr whose
+        union is full_mask, in lexicographic order, and return how many rows
+        were written.
+
+        Combinations are enumerated by an explicit backtracking over index
+        positions, keeping the union of each prefix. A prefix is abandoned as
+        soon as its union together with all remaining edges (suffix OR) can no
+        longer cover full_mask.
+
+        The search stops once out is full; its position (idx, prefix and the
+        depth state[0]) is kept in the arrays, so the next call resumes there.
+        The enumeration is exhausted once state[0] < 0.
+        """
+        m = all_edges_arr.shape[0]
+        count = 0
+
+        # idx[d] = index chosen at position d, prefix[d] = union of the first d choices
+        d = state[0]
+        while d >= 0 and count < out.shape[0]:
+            idx[d] += 1
+            i = idx[d]
+
+            # Neither more positions nor more edges can be gained by moving i right.
+            if i > m - (k - d) or (prefix[d] | suffix[i]) != full_mask:
+                d -= 1
+                continue
+
+            prefix[d + 1] = prefix[d] | all_edges_arr[i]
+            if d + 1 < k:
+                d += 1
+                idx[d] = i
+            elif prefix[k] == full_mask:
+                out[count] = idx
+                count += 1
+
+        state[0] = d
+        return count
+else:
+    _filter_covering = None
 
 
-def _incidence_graph_from_masks(edge_masks, n):
+# Number of covering k-subsets returned by each call of the _filter_covering kernel.
+_COVERING_CHUNK = 4096
+
+
+def _covering_combinations(all_edges, k, full_mask):
     """
-    Build the bipartite incidence graph B(H) for an hypergraph H described by:
-      - n vertices labeled 1..n
-      - hyperedges given as bitmasks in edge_masks
-
-    Node encoding:
-      - vertex-side nodes are ("v", v) with attribute bipartite=0
-      - edge-side nodes are ("e", eid) with attributes:
-          bipartite=1
-          size = |hyperedge|
-
-    Edges:
-      - connect ("e", eid) to ("v", v) iff v is contained in hyperedge eid.
+    Yield the k-subsets of all_edges (tuples of bitmasks) whose union is full_mask.
+
+    Uses the compiled _filter_covering kernel when numba is available and the
+    masks fit in uint64, and a pure-Python backtracking otherwise. The kernel
+    is resumed chunk by chunk, so memory does not grow with the number of
+    covering subsets.
     """
-    B = nx.Graph()
+    if _filter_covering is None or full_mask.bit_length() > 64:
+        yield from _covering_combinations_backtracking(all_edges, k, full_mask)
+        return
 
-    # Add vertex-side nodes.
-    for v in range(1, n + 1):
-        B.add_node(("v", v), bipartite=0)
+    all_edges_arr = np.asarray(all_edges, dtype=np.uint64)
 
-    # Add edge-side nodes + incidence edges.
-    for e_id, m in enumerate(edge_masks):
-        enode = ("e", e_id)
-        sz = _popcount(m)
-        B.add_node(enode, bipartite=1, size=sz)
+    # suffix[i] = OR of all_edges[i:]
+    suffix = np.zeros(len(all_edges) + 1, dtype=np.uint64)
+    suffix[:-1] = np.bitwise_or.accumulate(all_edges_arr[::-1])[::-1]
 
-        # For every vertex present in the bitmask, add incidence edge.
-        for i in range(n):
-            if (m >> i) & 1:
-                B.add_edge(enode, ("v", i + 1))
+    # Search state of the kernel, starting before the first combination.
+    idx = np.empty(k, dtype=np.int64)
+    idx[0] = -1
+    prefix = np.zeros(k + 1, dtype=np.uint64)
+    state = np.zeros(1, dtype=np.int64)
+    out = np.empty((_COVERING_CHUNK, k), dtype=np.int64)
 
-    return B
+    while state[0] >= 0:
+        count = _filter_covering(all_edges_arr, suffix, k, np.uint64(full_mask), idx, prefix, state, out)
+        for row in out[:count].tolist():
+            yield tuple(all_edges[i] for i in row)
 
 
-def _node_match(a, b):
+def _covering_combinations_backtracking(all_edges, k, full_mask):
     """
-    Exact node-matching rule for GraphMatcher on incidence graphs.
+    Pure-Python fallback of _covering_combinations, used without numba or for n > 64.
 
-    Requirements:
-      1) Preserve the bipartition: vertex-nodes must map to vertex-nodes,
-         edge-nodes to edge-nodes.
-      2) Additionally, preserve hyperedge size on the edge-side nodes.
-
-    Note:
-      - Condition (2) is logically redundant in many cases (degree equals size),
-        but making it explicit is safer and can speed up pruning.
+    k-subsets are built by a recursive backtracking that carries the union of
+    the edges chosen so far. A branch is pruned as soon as that union, together
+    with every edge still available (precomputed suffix ORs), cannot cover
+    full_mask.
     """
-    if a.get("bipartite") != b.get("bipartite"):
-        return False
-    if a.get("bipartite") == 1:
-        return a.get("size") == b.get("size")
-    return True
+    m = len(all_edges)
+
+    # suffix[i] = OR of all_edges[i:]
+    suffix = [0] * (m + 1)
+    for i in range(m - 1, -1, -1):
+        suffix[i] = suffix[i + 1] | all_edges[i]
+
+    chosen = []
 
+    def _gen(start, union):
+        remaining = k - len(chosen)
+        for i in range(start, m - remaining + 1):
+            if union | suffix[i] != full_mask:
+                return
+            chosen.append(all_edges[i])
+            new_union = union | all_edges[i]
+            if remaining == 1:
+                if new_union == full_mask:
+                    yield tuple(chosen)
+            else:
+                yield from _gen(i + 1, new_union)
+            chosen.pop()
 
-def _wl_hash_incidence_graph(B):
+    yield from _gen(0, 0)
+
+
+def _is_connected_masks(edge_masks, full_mask):
     """
-    Compute a fast graph-invariant hash (Weisfeiler-Lehman hash) used ONLY for
-    'bucketing' candidates before running exact isomorphism checks.
-
-    Important:
-      - WL-hash is NOT a complete isomorphism test (it can collide).
-      - We use it to reduce the number of expensive GraphMatcher calls.
-      - Correctness is guaranteed because we still run exact isomorphism checks
-        within each bucket.
-
-    We set node_attr="bipartite" to at least separate the two sides; sizes are
-    already encoded as a node attribute on edge nodes, but WL-hash call here
-    only uses 'bipartite'. If you want a stronger hash, you may incorporate
-    'size' by preprocessing node labels or using a different node_attr scheme.
+    Return True iff the incidence graph B(H) of the hypergraph on the vertices
+    in full_mask with hyperedges edge_masks is connected.
+
+    Starting from the first hyperedge, we repeatedly absorb every hyperedge that
+    intersects the current component. B(H) is connected iff the component ends
+    up covering every vertex (a covered vertex set also absorbs every hyperedge).
     """
-    try:
-        return nx.weisfeiler_lehman_graph_hash(B, node_attr="bipartite", edge_attr=None)
-    except Exception:
-        # Compatibility with some networkx versions
-        from networkx.algorithms.graph_hashing import weisfeiler_lehman_graph_hash
-        return weisfeiler_lehman_graph_hash(B, node_attr="bipartite", edge_attr=None)
+    component = edge_masks[0]
+    rest = list(edge_masks[1:])
+
+    grown = True
+    while grown:
+        grown = False
+        remaining = []
+        for m in rest:
+            if m & component:
+                component |= m
+                grown = True
+            else:
+                remaining.append(m)
+        rest = remaining
 
+    return component == full_mask
+
+
+def _fast_invariant(edge_masks, n):
+    """
+    Cheap isomorphism invariant of the hypergraph on vertices 1..n described by
+    edge_masks: the sorted multiset, over all vertices, of the sorted sizes of
+    the hyperedges containing that vertex.
 
-def _isomorphic_masks(edge_masks_a, n_a, edge_masks_b, n_b):
+    Isomorphic hypergraphs always share the invariant; the converse does not
+    hold, so it is only used to bucket candidates.
     """
-    Exact hypergraph isomorphism test between two candidates described as masks.
+    per_vertex = [[] for _ in range(n)]
+    for m in edge_masks:
+        sz = _popcount(m)
+        for i in _iter_bits(m):
+            per_vertex[i].append(sz)
+    return tuple(sorted(tuple(sorted(sizes)) for sizes in per_vertex))
 
-    We:
-      1) Build incidence graphs Ba and Bb
-      2) Run GraphMatcher with our bipartite-preserving node_match
-      3) Return True iff Ba and Bb are isomorphic under that constraint.
 
-    Since we enforce bipartition and edge-size preservation, this corresponds
-    to hypergraph isomorphism for our simple hypergraph representation.
+def _canonical_label_masks(edge_masks, n):
+    """
+    Canonical label (see isomorphism.canonical_label) of the hypergraph on
+    vertices 1..n whose hyperedges are given as bitmasks in edge_masks.
     """
-    Ba = _incidence_graph_from_masks(edge_masks_a, n_a)
-    Bb = _incidence_graph_from_masks(edge_masks_b, n_b)
-    gm = GraphMatcher(Ba, Bb, node_match=_node_match)
-    return gm.is_isomorphic()
+    edges = []
+    for m in edge_masks:
+        edges.append(list(_iter_bits(m)))
+    return _incidence_certificate(n, edges)
 
 
 def generate_nonisomorphic_hypergraphs(k, alpha, max_vertices=None, require_no_isolated=True, require_connected=True):
@@ -145,12 +210,14 @@ def generate_nonisomorphic_hypergraphs(k, alpha, max_vertices=None, require_no_i
     Efficiency strategy:
       - Enumerate hyperedges on n labeled vertices using bitmasks.
       - Enumerate k-subsets of those hyperedges (no duplicates).
-      - Use WL-hash of the incidence graph to bucket candidates quickly.
-      - Within each bucket, use exact GraphMatcher isomorphism to keep only
-        one representative per isomorphism class.
+      - Bucket candidates by a cheap vertex-degree-signature invariant.
+      - Within each bucket, keep a set of nauty canonical labels so that only
+        one representative per isomorphism class survives. Labels are only
+        computed once a bucket holds more than one candidate.
 
     Return:
-      - list of Hypergraph objects (one representative per isomorphism class).
+      - list of Hypergraph objects (one representative per isomorphism class),
+        in the order in which the classes are discovered.
     """
     if k <= 0:
         raise ValueError("k must be >= 1")
@@ -162,10 +229,16 @@ def generate_nonisomorphic_hypergraphs(k, alpha, max_vertices=None, require_no_i
     if max_vertices <= 0:
         return []
 
-    # Dictionary: WL-hash -> list of representatives (n, edge_masks)
-    # Each representative stands for an isomorphism class (within that WL bucket
-    # we still check exact isomorphism).
-    reps_by_hash = {}
+    # Representatives (n, edge_masks), one per isomorphism class, in discovery order.
+    reps = []
+
+    # Dictionary: invariant -> first representative (n, edge_masks) with that invariant.
+    first_by_invariant = {}
+
+    # Dictionary: invariant -> set of canonical labels of the bucket's
+    # representatives. A singleton bucket has no entry: its label is only
+    # computed once another candidate falls into the same bucket.
+    labels_by_invariant = {}
 
     # Try all possible numbers of vertices.
     for n in range(1, max_vertices + 1):
@@ -190,50 +263,45 @@ def generate_nonisomorphic_hypergraphs(k, alpha, max_vertices=None, require_no_i
             continue
 
         # Enumerate all k-subsets of distinct hyperedges (simple hypergraphs).
-        for edge_masks in itertools.combinations(all_edges, k):
-
-            # Optional filter: ensure all vertices 1..n are covered by at least one edge.
-            if require_no_isolated:
-                union = 0
-                for m in edge_masks:
-                    union |= m
-                if union != full_mask:
-                    continue
-
-            # Build incidence graph and compute WL hash for fast bucketing.
-            B = _incidence_graph_from_masks(edge_masks, n)
-            if require_connected and not nx.is_connected(B):
-                continue
+        # Optional filter: ensure all vertices 1..n are covered by at least one edge.
+        if require_no_isolated:
+            candidates = _covering_combinations(all_edges, k, full_mask)
+        else:
+            candidates = itertools.combinations(all_edges, k)
 
-            # WL hash for fast bucketing
-            h = _wl_hash_incidence_graph(B)
+        for edge_masks in candidates:
 
-            bucket = reps_by_hash.setdefault(h, [])
+            if require_connected and not _is_connected_masks(edge_masks, full_mask):
+                continue
 
-            # Check exact isomorphism only against current representatives in the same bucket.
-            is_new = True
-            for (n_rep, masks_rep) in bucket:
+            inv = _fast_invariant(edge_masks, n)
+            first = first_by_invariant.get(inv)
 
-                # Different n => cannot be isomorphic under our convention
-                # (we are enumerating on exactly n participating vertices).
-                if n_rep != n:
-                    continue
+            # First candidate with this invariant: it cannot be isomorphic to any
+            # known representative, so no canonical label is needed yet.
+            if first is None:
+                first_by_invariant[inv] = (n, edge_masks)
+                reps.append((n, edge_masks))
+                continue
 
-                if _isomorphic_masks(edge_masks, n, masks_rep, n_rep):
-                    is_new = False
-                    break
+            # Collision: the candidate is new iff its canonical label is not among
+            # the labels of the bucket (set lookup, no pairwise comparisons).
+            labels = labels_by_invariant.get(inv)
+            if labels is None:
+                n_rep, masks_rep = first
+                labels = labels_by_invariant[inv] = {_canonical_label_masks(masks_rep, n_rep)}
 
-            # If not isomorphic to any known representative in this bucket, keep it.
-            if is_new:
-                bucket.append((n, edge_masks))
+            cert = _canonical_label_masks(edge_masks, n)
+            if cert not in labels:
+                labels.add(cert)
+                reps.append((n, edge_masks))
 
     # Convert all representatives into Hypergraph objects (using vertex labels 1..n).
     out = []
-    for bucket in reps_by_hash.values():
-        for (n, edge_masks) in bucket:
-            edges = [_mask_to_frozenset(m, n) for m in edge_masks]
-            H = Hypergraph.from_edges(edges)
-            out.append(H)
+    for (n, edge_masks) in reps:
+        edges = [_mask_to_frozenset(m, n) for m in edge_masks]
+        H = Hypergraph.from_edges(edges)
+        out.append(H)
 
     return out
 
@@ -247,18 +315,15 @@ def hypergraph_to_set_of_sets_string(H):
       - We print using integer labels if your hypergraph uses integers.
       - For non-integers, we print their str() values.
       - Sets are printed in a stable order for readability.
+      - The rendering is computed and cached by H.set_of_sets_string().
     """
-    # Sort edges first by size, then lexicographically by stringified vertices.
-    def edge_key(e):
-        return (len(e), [str(x) for x in sorted(e, key=str)])
+    return H.set_of_sets_string()
 
-    edges_sorted = sorted(H.edges, key=edge_key)
 
-    edge_parts = []
-    for e in edges_sorted:
-        verts = ", ".join(str(v) for v in sorted(e, key=str))
-        edge_parts.append("{" + verts + "}")
-    return "{" + ", ".join(edge_parts) + "}"
+# Output buffer size, and number of lines joined into a single write, used by
+# write_hypergraphs_to_file.
+_WRITE_BUFFER = 1 << 20
+_WRITE_BATCH = 4096
 
 
 def write_hypergraphs_to_file(hypergraphs, filepath):
@@ -275,6 +340,11 @@ def write_hypergraphs_to_file(hypergraphs, filepath):
       - hypergraphs: iterable of Hypergraph objects
       - filepath: output text file path
     """
-    with open(filepath, "w", encoding="utf-8") as f:
+    with open(filepath, "w", encoding="utf-8", buffering=_WRITE_BUFFER) as f:
+        batch = []
         for H in hypergraphs:
-            f.write(hypergraph_to_set_of_sets_string(H) + "\n")
\ No newline at end of file
+            batch.append(hypergraph_to_set_of_sets_string(H) + "\n")
+            if len(batch) == _WRITE_BATCH:
+                f.write("".join(batch))
+                batch.clear()
+        f.write("".join(batch))
\ No newline at end of file
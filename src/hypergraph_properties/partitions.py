@@ -1,4 +1,25 @@
-import math
+from functools import lru_cache
+
+# Factorial lookup table, extended on demand by _factorial.
+_FACT = [1]
+
+
+def _factorial(m):
+    if m < 0:
+        raise ValueError("factorial() not defined for negative values")
+    while len(_FACT) <= m:
+        _FACT.append(_FACT[-1] * len(_FACT))
+    return _FACT[m]
+
+
+@lru_cache(maxsize=None)
+def _moebius_k(k):
+    """
+    Return (-1)^(k-1) * (k-1)!, the Möbius value of a block (or partition) of size k.
+    """
+    return (-1) ** (k - 1) * _factorial(k - 1)
+
+
 def normalize_partition(partition):
     blocks = []
     for blk in partition:
@@ -36,25 +57,41 @@ def vertex_to_block_map(blocks):
 
 
 def all_partitions(n):
+    """
+    Generate all partitions of {1, ..., n}, each as a list of blocks (sets).
+
+    Partitions are enumerated iteratively as restricted growth strings
+    a[0..n-1], with a[0] = 0 and a[i] <= 1 + max(a[0..i-1]), where element
+    i+1 belongs to block a[i] (Knuth, TAOCP 7.2.1.5, Algorithm H).
+    """
     if n <= 0:
         return [[]]
-    if n == 1:
-        return [[{1}]]
 
-    prev_partitions = all_partitions(n - 1)
+    # b[i] is the largest value allowed for a[i], i.e. 1 + max(a[0..i-1]).
+    a = [0] * n
+    b = [1] * n
+    b[0] = 0
     result = []
 
-    for part in prev_partitions:
-        new_part = [block.copy() for block in part]
-        new_part.append({n})
-        result.append(new_part)
-
-        for i in range(len(part)):
-            new_part = [block.copy() for block in part]
-            new_part[i].add(n)
-            result.append(new_part)
-
-    return result
+    while True:
+        blocks = [set() for _ in range(max(a) + 1)]
+        for i, blk in enumerate(a):
+            blocks[blk].add(i + 1)
+        result.append(blocks)
+
+        # Increment the rightmost position that has not reached its bound.
+        j = n - 1
+        while j > 0 and a[j] == b[j]:
+            j -= 1
+        if j == 0:
+            return result
+        a[j] += 1
+
+        # Reset the tail; its bound grows if a[j] opened a new block.
+        bound = b[j] + (a[j] == b[j])
+        for i in range(j + 1, n):
+            a[i] = 0
+            b[i] = bound
 
 def vertex_partitions(vertices):
     """
@@ -79,8 +116,7 @@ def moebius_function_top(partition):
     Computes the top moebius function for a given partition rho:
     mu(rho) = (-1)^(|rho|-1) * (|rho|-1)!
     """
-    rho = len(partition)
-    return (-1) ** (rho - 1) * math.factorial(rho - 1)
+    return _moebius_k(len(partition))
 
 def moebius_function(partition):
     """
@@ -90,7 +126,6 @@ def moebius_function(partition):
     result = 1
 
     for block in partition:
-        size = len(block)
-        result *= (-1) ** (size - 1) * math.factorial(size - 1)
+        result *= _moebius_k(len(block))
 
     return result
\ No newline at end of file
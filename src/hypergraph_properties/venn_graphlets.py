@@ -1,5 +1,7 @@
 from itertools import permutations
 
+import numpy as np
+
 
 def _regions_signature(A, B, C):
     """
@@ -44,6 +46,22 @@ def _regions_signature(A, B, C):
     return sig
 
 
+def _regions_signature_masks(a, b, c):
+    """
+    Same 7-bit signature as _regions_signature, for three hyperedges given as
+    bitmasks over a common vertex indexing (e.g. Hypergraph._edge_masks).
+    """
+    return (
+        ((a & ~b & ~c) != 0)
+        | (((b & ~c & ~a) != 0) << 1)
+        | (((c & ~a & ~b) != 0) << 2)
+        | (((a & b & ~c) != 0) << 3)
+        | (((b & c & ~a) != 0) << 4)
+        | (((c & a & ~b) != 0) << 5)
+        | (((a & b & c) != 0) << 6)
+    )
+
+
 def _permute_signature(sig, perm):
     """
     Given a 7-bit signature computed for (A, B, C), return the signature obtained
@@ -92,21 +110,34 @@ def _permute_signature(sig, perm):
     return out
 
 
+def _compute_canonical(sig):
+    """
+    Minimum signature among the 6 permutations of the three hyperedges.
+    """
+    best = None
+    for perm in permutations((0, 1, 2), 3):
+        s2 = _permute_signature(sig, perm)
+        best = s2 if best is None else min(best, s2)
+    return best
+
+
+# Lookup table: raw signature -> canonical signature, for all 128 signatures.
+_CANON = tuple(_compute_canonical(s) for s in range(128))
+_CANON_ARR = np.array(_CANON, dtype=np.int8)
+
+
 def canonical_signature(sig):
     """
     Return the canonical (order-invariant) version of a signature.
 
     The canonical signature is defined as the minimum integer among all
     signatures obtained by permuting the three hyperedges (6 permutations).
+    It is read from the precomputed _CANON table.
 
     Two Venn patterns are considered equivalent if and only if they have
     the same canonical signature.
     """
-    best = None
-    for perm in permutations((0, 1, 2), 3):
-        s2 = _permute_signature(sig, perm)
-        best = s2 if best is None else min(best, s2)
-    return best
+    return _CANON[sig]
 
 
 class VennGraphlet3:
@@ -167,10 +198,46 @@ class VennGraphlet3:
             raise ValueError("Expected exactly 3 hyperedges in the Hypergraph.")
 
         e1, e2, e3 = H.edges[0], H.edges[1], H.edges[2]
-        return VennGraphlet3.from_edges(
-            e1, e2, e3
+        raw = _regions_signature_masks(*H._edge_masks)
+        return VennGraphlet3(e1, e2, e3, raw_signature=raw, signature=canonical_signature(raw))
+
+    @staticmethod
+    def classify_batch(hypergraphs):
+        """
+        Return the canonical signatures of a corpus of hypergraphs as an int8 array.
+
+        Every hypergraph must contain exactly 3 hyperedges. The bitmask edges of
+        all hypergraphs are stacked into (N,) arrays a, b, c, so that the 7 region
+        bits of the whole corpus are computed at once with NumPy bitwise ops,
+        followed by a lookup in the canonical signature table.
+        """
+        triples = []
+        for H in hypergraphs:
+            if H.num_edges() != 3:
+                raise ValueError("Expected exactly 3 hyperedges in the Hypergraph.")
+            triples.append(H._edge_masks)
+
+        # Masks wider than 64 bits are kept as Python ints (object arrays).
+        wide = any(m.bit_length() > 64 for t in triples for m in t)
+        masks = np.array(triples, dtype=object if wide else np.uint64).reshape(-1, 3)
+        a, b, c = masks[:, 0], masks[:, 1], masks[:, 2]
+        na, nb, nc = ~a, ~b, ~c
+
+        regions = (
+            a & nb & nc,
+            b & nc & na,
+            c & na & nb,
+            a & b & nc,
+            b & c & na,
+            c & a & nb,
+            a & b & c,
         )
 
+        sig = np.zeros(len(masks), dtype=np.uint8)
+        for i, r in enumerate(regions):
+            sig |= (r != 0).astype(np.uint8) << i
+        return _CANON_ARR[sig]
+
     def bits(self):
         """
         Return the 7 canonical signature bits as a tuple.
@@ -0,0 +1,25 @@
+import math
+
+from hypergraph_properties.hypergraph import Hypergraph
+from hypergraph_properties.isomorphism import count_automorphisms, hypergraph_automorphisms
+
+
+def test_count_automorphisms_large_group_is_exact():
+    # nauty reports 14! = 87178291200 as 8.71782912 * 10**10.
+    H = Hypergraph.from_edges([set(range(14))])
+    assert count_automorphisms(H) == math.factorial(14)
+
+
+def test_count_automorphisms_product_of_symmetric_groups():
+    H = Hypergraph.from_edges([set(range(12)), set(range(100, 112))])
+    assert count_automorphisms(H) == 2 * math.factorial(12) ** 2
+
+
+def test_count_automorphisms_matches_enumeration():
+    H = Hypergraph.from_edges([{1, 2}, {2, 3}, {3, 4}, {4, 1}])
+    assert count_automorphisms(H) == len(hypergraph_automorphisms(H)) == 8
+
+
+def test_hypergraph_automorphisms_limit_zero_returns_identity():
+    H = Hypergraph.from_edges([{1, 2}, {2, 3}])
+    assert hypergraph_automorphisms(H, limit=0) == [{1: 1, 2: 2, 3: 3}]